@@ -1,22 +1,44 @@
+import threading
+from collections import OrderedDict
+
 from langchain_core.chat_history import (
     BaseChatMessageHistory,  # 基础聊天消息历史类
     InMemoryChatMessageHistory,  # 内存中的聊天消息历史类
 )
 
-# 用于存储会话历史的字典
-store = {}
+# 最多保留的会话数，超出后淘汰最久未访问的会话
+MAX_SESSIONS = 1000
+# 每个会话最多保留的对话轮数（一轮包含一条用户消息和一条 AI 回复）
+MAX_TURNS = 8
+
+# 用于存储会话历史的有序字典，按访问顺序排列，实现 LRU 淘汰
+store = OrderedDict()
+# 保护 store 的锁，Gradio 会在多个线程中并发处理请求
+store_lock = threading.Lock()
 
 def get_session_history(session_id: str) -> BaseChatMessageHistory:
     """
     获取指定会话ID的聊天历史。如果该会话ID不存在，则创建一个新的聊天历史实例。
-    
+    返回前仅保留最近 MAX_TURNS 轮对话，避免每次请求发送的历史消息无限增长。
+
     参数:
         session_id (str): 会话的唯一标识符
-    
+
     返回:
         BaseChatMessageHistory: 对应会话的聊天历史对象
     """
-    if session_id not in store:
-        # 如果会话ID不存在于存储中，创建一个新的内存聊天历史实例
-        store[session_id] = InMemoryChatMessageHistory()
-    return store[session_id]
\ No newline at end of file
+    with store_lock:
+        if session_id not in store:
+            # 如果会话ID不存在于存储中，创建一个新的内存聊天历史实例
+            store[session_id] = InMemoryChatMessageHistory()
+            # 会话数超出上限时，淘汰最久未访问的会话
+            if len(store) > MAX_SESSIONS:
+                store.popitem(last=False)
+        else:
+            # 标记为最近访问
+            store.move_to_end(session_id)
+
+        history = store[session_id]
+        # 原地删除较早的消息，仅保留最近的若干轮对话，避免替换列表导致并发追加的消息丢失
+        del history.messages[:-2 * MAX_TURNS]
+        return history
@@ -1,13 +1,14 @@
 # chatbot.py
 
-from abc import ABC, abstractmethod
+from abc import ABC
 
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder  # 导入提示模板相关类
 from langchain_core.messages import HumanMessage  # 导入消息类
 from langchain_core.runnables.history import RunnableWithMessageHistory  # 导入带有消息历史的可运行类
 
 from logger import LOG  # 导入日志工具
+from llm_client import get_llm, MODEL_NAME  # 导入共享的 LLM 客户端
+from prompt_loader import read_prompt  # 导入提示文件加载工具
 from chat_history import get_session_history
 
 
@@ -15,6 +16,9 @@ class ChatBot(ABC):
     """
     聊天机器人基类，提供聊天功能。
     """
+    # 已构建的可运行对象缓存，键为 (系统提示, 模型名称)，相同配置的实例共享同一组对象
+    _runnable_cache = {}
+
     def __init__(self, prompt_file="./prompts/chatbot.txt", session_id=None):
         self.prompt_file = prompt_file
         self.session_id = session_id if session_id else "default_session_id"
@@ -27,8 +31,7 @@ class ChatBot(ABC):
         从文件加载系统提示语。
         """
         try:
-            with open(self.prompt_file, "r", encoding="utf-8") as file:
-                return file.read().strip()
+            return read_prompt(self.prompt_file)
         except FileNotFoundError:
             raise FileNotFoundError(f"找不到提示文件 {self.prompt_file}!")
 
@@ -37,21 +40,23 @@ class ChatBot(ABC):
         """
         初始化聊天机器人，包括系统提示和消息历史记录。
         """
-        # 创建聊天提示模板，包括系统提示和消息占位符
-        system_prompt = ChatPromptTemplate.from_messages([
-            ("system", self.prompt),  # 系统提示部分
-            MessagesPlaceholder(variable_name="messages"),  # 消息占位符
-        ])
-
-        # 初始化 ChatOllama 模型，配置参数
-        self.chatbot = system_prompt | ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.5,
-            max_tokens=4096
-        )
+        key = (self.prompt, MODEL_NAME)
+        if key not in ChatBot._runnable_cache:
+            # 创建聊天提示模板，包括系统提示和消息占位符
+            system_prompt = ChatPromptTemplate.from_messages([
+                ("system", self.prompt),  # 系统提示部分
+                MessagesPlaceholder(variable_name="messages"),  # 消息占位符
+            ])
+
+            # 使用共享的 ChatOpenAI 客户端，复用连接池
+            chatbot = system_prompt | get_llm()
+
+            # 将聊天机器人与消息历史记录关联
+            chatbot_with_history = RunnableWithMessageHistory(chatbot, get_session_history)
+
+            ChatBot._runnable_cache[key] = (chatbot, chatbot_with_history)
 
-        # 将聊天机器人与消息历史记录关联
-        self.chatbot_with_history = RunnableWithMessageHistory(self.chatbot, get_session_history)
+        self.chatbot, self.chatbot_with_history = ChatBot._runnable_cache[key]
 
 
     def chat_with_history(self, user_input, session_id=None):
@@ -74,4 +79,28 @@ class ChatBot(ABC):
         )
 
         LOG.debug(f"[ChatBot] {response.content}")  # 记录调试日志
-        return response.content  # 返回生成的回复内容
\ No newline at end of file
+        return response.content  # 返回生成的回复内容
+
+    def stream_chat_with_history(self, user_input, session_id=None):
+        """
+        以流式方式处理用户输入，逐步生成包含聊天历史的回复。
+
+        参数:
+            user_input (str): 用户输入的消息
+            session_id (str, optional): 会话的唯一标识符
+
+        返回:
+            Iterator[str]: 截至当前已生成的完整回复内容
+        """
+        if session_id is None:
+            session_id = self.session_id
+
+        content = ""
+        for chunk in self.chatbot_with_history.stream(
+            [HumanMessage(content=user_input)],  # 将用户输入封装为 HumanMessage
+            {"configurable": {"session_id": session_id}},  # 传入配置，包括会话ID
+        ):
+            content += chunk.content
+            yield content  # 每收到一个片段即返回累积的回复内容
+
+        LOG.debug(f"[ChatBot] {content}")  # 记录调试日志
\ No newline at end of file
@@ -29,7 +29,6 @@ class Config:
             # 加载 ChatBot 提示信息
             self.chatbot_prompt = config.get('chatbot_prompt', '')
 
-            # 加载内容格式化提示和助手提示
+            # 加载内容格式化提示
             self.content_formatter_prompt = config.get('content_formatter_prompt', '')
-            self.content_assistant_prompt = config.get('content_assistant_prompt', '')
             self.image_advisor_prompt = config.get('image_advisor_prompt', '')
\ No newline at end of file
@@ -1,12 +1,21 @@
 # content_formatter.py
-from abc import ABC, abstractmethod
+import threading
+from abc import ABC
+from collections import OrderedDict
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder  # 导入提示模板相关类
-from langchain_core.messages import HumanMessage  # 导入消息类
-from langchain_core.runnables.history import RunnableWithMessageHistory  # 导入带有消息历史的可运行类
+from langchain_core.prompts import ChatPromptTemplate  # 导入提示模板相关类
 
 from logger import LOG  # 导入日志工具
+from llm_client import get_llm, FORMAT_TEMPERATURE, estimate_max_tokens  # 导入共享的 LLM 客户端
+from prompt_loader import read_prompt  # 导入提示文件加载工具
+
+# 缓存的最大条目数
+CACHE_SIZE = 32
+
+# 格式化结果缓存，以 (系统提示, 原始内容) 为键，按访问顺序排列，实现 LRU 淘汰
+_format_cache = OrderedDict()
+# 保护 _format_cache 的锁，Gradio 会在多个线程中并发处理请求
+_format_cache_lock = threading.Lock()
 
 class ContentFormatter(ABC):
     """
@@ -23,8 +32,7 @@ class ContentFormatter(ABC):
         从文件加载系统提示语。
         """
         try:
-            with open(self.prompt_file, "r", encoding="utf-8") as file:
-                return file.read().strip()
+            return read_prompt(self.prompt_file)
         except FileNotFoundError:
             raise FileNotFoundError(f"找不到提示文件 {self.prompt_file}!")
 
@@ -33,34 +41,53 @@ class ContentFormatter(ABC):
         """
         初始化聊天机器人，包括系统提示和消息历史记录。
         """
-        # 创建聊天提示模板，包括系统提示和消息占位符
-        system_prompt = ChatPromptTemplate.from_messages([
+        # 创建聊天提示模板，包括系统提示和消息占位符；提示要求一次调用同时完成格式化与单图拆分
+        self.formatter_prompt = ChatPromptTemplate.from_messages([
             ("system", self.prompt),  # 系统提示部分
             ("human", "{input}"),  # 消息占位符
         ])
-        
-        self.model = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.5,
-            max_tokens=4096,
-        )
-        
-        self.formatter = system_prompt | self.model  # 使用的模型名称)
+
+        # 使用共享的 ChatOpenAI 客户端，复用连接池；格式化属于确定性改写，使用较低温度
+        self.model = get_llm().bind(temperature=FORMAT_TEMPERATURE)
+
+    def create_chain(self, prompt, content):
+        """
+        根据输入内容长度设置生成上限，构建提示模板与模型组成的调用链。
+        """
+        return prompt | self.model.bind(max_tokens=estimate_max_tokens(content))
 
 
-    def format(self, raw_content):
+    def format_and_adjust(self, raw_content):
         """
-        
+        在一次 LLM 调用中完成格式化与单图拆分（每页最多一张图片）。
+        相同提示与输入直接复用缓存结果，避免重复调用 LLM；被截断的输出不会写入缓存。
 
         参数:
             raw_content (str): 解析后的 markdown 原始格式
 
         返回:
-            str: 格式化后的 markdown 内容
+            str: 格式化且每页最多一张图片的 markdown 内容
         """
-        response = self.formatter.invoke({
+        key = (self.prompt, raw_content)
+        with _format_cache_lock:
+            if key in _format_cache:
+                # 标记为最近访问
+                _format_cache.move_to_end(key)
+                return _format_cache[key]
+
+        response = self.create_chain(self.formatter_prompt, raw_content).invoke({
             "input": raw_content,
         })
 
-        LOG.debug(f"[Formmater 格式化后]\n{response.content}")  # 记录调试日志
-        return response.content  # 返回生成的回复内容
\ No newline at end of file
+        LOG.debug(f"[Formmater 格式化并拆分配图后]\n{response.content}")  # 记录调试日志
+        # 输出因达到按输入估算的生成上限而被截断
+        if response.response_metadata.get("finish_reason") == "length":
+            LOG.warning(f"[Formmater 输出被截断] 已达到生成上限，输入长度: {len(raw_content)} 字符")
+            return response.content
+
+        with _format_cache_lock:
+            _format_cache[key] = response.content
+            # 缓存条目数超出上限时，淘汰最久未访问的结果
+            if len(_format_cache) > CACHE_SIZE:
+                _format_cache.popitem(last=False)
+        return response.content  # 返回生成的回复内容
@@ -1,31 +1,36 @@
 import gradio as gr
 import os
+import time
+import uuid
 
 from gradio.data_classes import FileData
 
 from config import Config
 from chatbot import ChatBot
 from content_formatter import ContentFormatter
-from content_assistant import ContentAssistant
 from image_advisor import ImageAdvisor
 from input_parser import parse_input_text
 from ppt_generator import generate_presentation
 from template_manager import load_template, get_layout_mapping
 from layout_manager import LayoutManager
 from logger import LOG
-from openai_whisper import asr, transcribe
+from llm_client import warmup as warmup_llm
+from openai_whisper import asr, transcribe, warmup as warmup_asr
 # from minicpm_v_model import chat_with_image
 from docx_parser import generate_markdown_from_docx
 
+# 每个事件允许同时处理的请求数。同步处理函数由 Gradio 在线程池中执行，
+# 默认并发数为 1 会使多个用户的请求串行排队
+CONCURRENCY_LIMIT = 8
 
-os.environ["LANGCHAIN_TRACING_V2"] = "true"
-os.environ["LANGCHAIN_PROJECT"] = "ChatPPT"
+
+# LangSmith 追踪默认关闭（每次调用都会额外上报 HTTP 请求），如需开启可设置环境变量 LANGCHAIN_TRACING_V2=true
+os.environ.setdefault("LANGCHAIN_PROJECT", "ChatPPT")
 
 # 实例化 Config，加载配置文件
 config = Config()
 chatbot = ChatBot(config.chatbot_prompt)
 content_formatter = ContentFormatter(config.content_formatter_prompt)
-content_assistant = ContentAssistant(config.content_assistant_prompt)
 image_advisor = ImageAdvisor(config.image_advisor_prompt)
 
 # 加载 PowerPoint 模板，并获取可用布局
@@ -35,8 +40,18 @@ ppt_template = load_template(config.ppt_template)
 layout_manager = LayoutManager(get_layout_mapping(ppt_template))
 
 
+def get_session_dir(request):
+    """
+    获取当前浏览器会话的目录名，用于隔离不同用户生成的文件，避免并发请求相互覆盖。
+    无法获取会话信息时（如直接调用处理函数），为本次请求生成唯一的目录名。
+    """
+    if request and request.session_hash:
+        return request.session_hash
+    return uuid.uuid4().hex
+
+
 # 定义生成幻灯片内容的函数
-def generate_contents(message, history):
+def generate_contents(message, history, request: gr.Request):
     try:
         # 初始化一个列表，用于收集用户输入的文本和音频转录
         texts = []
@@ -66,8 +81,9 @@ def generate_contents(message, history):
             elif file_ext in ('.docx', '.doc'):
                 # 调用 generate_markdown_from_docx 函数，获取 markdown 内容
                 raw_content = generate_markdown_from_docx(uploaded_file)
-                markdown_content = content_formatter.format(raw_content)
-                return content_assistant.adjust_single_picture(markdown_content)
+                # 一次调用同时完成格式化与单图拆分
+                yield content_formatter.format_and_adjust(raw_content)
+                return
             else:
                 LOG.debug(f"[格式不支持]: {uploaded_file}")
 
@@ -75,22 +91,24 @@ def generate_contents(message, history):
         user_requirement = "需求如下:\n" + "\n".join(texts)
         LOG.info(user_requirement)
 
-        # 与聊天机器人进行对话，生成幻灯片内容
-        slides_content = chatbot.chat_with_history(user_requirement)
-
-        return slides_content
+        # 与聊天机器人进行对话，流式返回生成的幻灯片内容
+        # 每个浏览器会话使用独立的聊天历史，避免并发请求读写同一会话
+        session_id = request.session_hash if request else None
+        yield from chatbot.stream_chat_with_history(user_requirement, session_id)
     except Exception as e:
         LOG.error(f"[内容生成错误]: {e}")
         # 抛出 Gradio 错误，以便在界面上显示友好的错误信息
         raise gr.Error(f"网络问题，请重试:)")
         
 
-def handle_image_generate(history):
+def handle_image_generate(history, request: gr.Request):
     try:
         # 获取聊天记录中的最新内容
         slides_content = history[-1]["content"]
 
-        content_with_images, image_pair = image_advisor.generate_images(slides_content)
+        # 每个会话的配图保存在独立目录中
+        image_directory = f"tmps/{get_session_dir(request)}"
+        content_with_images, image_pair = image_advisor.generate_images(slides_content, image_directory)
         
         # for k, v in image_pair.items():
         #     history.append(
@@ -109,14 +127,16 @@ def handle_image_generate(history):
         raise gr.Error(f"【提示】未找到合适配图，请重试！")
 
 # 定义处理生成按钮点击事件的函数
-def handle_generate(history):
+def handle_generate(history, request: gr.Request):
     try:
         # 获取聊天记录中的最新内容
         slides_content = history[-1]["content"]
         # 解析输入文本，生成幻灯片数据和演示文稿标题
         powerpoint_data, presentation_title = parse_input_text(slides_content, layout_manager)
-        # 定义输出的 PowerPoint 文件路径
-        output_pptx = f"outputs/{presentation_title}.pptx"
+        # 定义输出的 PowerPoint 文件路径，每个会话使用独立的输出目录
+        output_directory = f"outputs/{get_session_dir(request)}"
+        os.makedirs(output_directory, exist_ok=True)
+        output_pptx = os.path.join(output_directory, f"{presentation_title}.pptx")
         
         # 生成 PowerPoint 演示文稿
         generate_presentation(powerpoint_data, config.ppt_template, output_pptx)
@@ -157,7 +177,7 @@ with gr.Blocks(
 
     # 定义 ChatBot 和生成内容的接口
     gr.ChatInterface(
-        fn=generate_contents,  # 处理用户输入的函数
+        fn=generate_contents,  # 处理用户输入的函数（生成器，流式返回回复）
         chatbot=contents_chatbot,  # 绑定的聊天机器人
         type="messages",
         multimodal=True  # 支持多模态输入（文本和文件）
@@ -183,8 +203,18 @@ with gr.Blocks(
 
 # 主程序入口
 if __name__ == "__main__":
+    # 预热语音识别模型与 LLM 连接，避免首个用户请求承担初始化开销
+    for name, warmup in (("语音识别模型", warmup_asr), ("LLM 连接", warmup_llm)):
+        start = time.perf_counter()
+        try:
+            warmup()
+            LOG.info(f"[{name}预热完成] 耗时 {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            # 预热失败不影响服务启动，首个请求将承担初始化开销
+            LOG.warning(f"[{name}预热失败]: {e}")
+
     # 启动Gradio应用，允许队列功能，并通过 HTTPS 访问
-    demo.queue().launch(
+    demo.queue(default_concurrency_limit=CONCURRENCY_LIMIT).launch(
         share=False,
         server_name="0.0.0.0",
         # auth=("django", "qaz!@#$") # ⚠️注意：记住修改密码
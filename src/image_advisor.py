@@ -3,14 +3,16 @@ import requests
 import os
 
 from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 from PIL import Image
 from io import BytesIO
 
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 
 from logger import LOG  # 导入日志工具
+from llm_client import get_llm  # 导入共享的 LLM 客户端
+from prompt_loader import read_prompt  # 导入提示文件加载工具
 
 class ImageAdvisor(ABC):
     """
@@ -26,8 +28,7 @@ class ImageAdvisor(ABC):
         从文件加载系统提示语。
         """
         try:
-            with open(self.prompt_file, "r", encoding="utf-8") as file:
-                return file.read().strip()
+            return read_prompt(self.prompt_file)
         except FileNotFoundError:
             LOG.error(f"找不到提示文件 {self.prompt_file}!")
             raise
@@ -41,14 +42,11 @@ class ImageAdvisor(ABC):
             ("human", "**Content**:\n\n{input}"),  # 消息占位符
         ])
 
-        self.model = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.7,
-            max_tokens=4096,
-        )
+        # 使用共享的 ChatOpenAI 客户端，复用连接池；配图建议需要更高的多样性
+        self.model = get_llm().bind(temperature=0.7)
         self.advisor = chat_prompt | self.model
 
-    def generate_images(self, markdown_content, image_directory="tmps", num_images=3):
+    def generate_images(self, markdown_content, image_directory="tmps", num_images=3, max_workers=4):
         """
         生成图片并嵌入到指定的 PowerPoint 内容中。
 
@@ -56,6 +54,7 @@ class ImageAdvisor(ABC):
             markdown_content (str): PowerPoint markdown 原始格式
             image_directory (str): 本地保存图片的文件夹名称
             num_images (int): 每个幻灯片搜索的图像数量
+            max_workers (int): 并发检索图像的线程数
 
         返回:
             content_with_images (str): 嵌入图片后的内容
@@ -70,9 +69,15 @@ class ImageAdvisor(ABC):
         keywords = self.get_keywords(response.content)
         image_pair = {}
 
-        for slide_title, query in keywords.items():
-            # 检索图像
-            images = self.get_bing_images(slide_title, query, num_images, timeout=1, retries=3)
+        # 各幻灯片的图像检索相互独立，并发执行以重叠网络等待时间
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                slide_title: executor.submit(self.get_bing_images, slide_title, query, num_images, timeout=1, retries=3)
+                for slide_title, query in keywords.items()
+            }
+
+        for slide_title, future in futures.items():
+            images = future.result()
             if images:
                 for image in images:
                     LOG.debug(f"Name: {image['slide_title']}, Query: {image['query']} 分辨率：{image['width']}x{image['height']}")
@@ -0,0 +1,93 @@
+# llm_client.py
+
+import threading
+import time
+
+import tiktoken
+from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+from langchain_core.messages import HumanMessage  # 导入消息类
+from langchain_openai import ChatOpenAI
+
+from logger import LOG  # 导入日志工具
+
+# 模型名称和参数配置
+MODEL_NAME = "gpt-4o-mini"  # OpenAI 模型名称
+MAX_OUTPUT_TOKENS = 4096  # 单次生成的最大 token 数
+# 按输入估算生成上限时的最小值。格式化提示会为拆分后的幻灯片补充过渡与说明内容，
+# 短输入的输出可能远超输入的 2 倍，因此不采用更低的下限（如 256），避免输出被截断
+MIN_OUTPUT_TOKENS = 1024
+FORMAT_TEMPERATURE = 0.2  # 格式化等确定性改写任务使用的较低温度
+ENCODING_RETRY_INTERVAL = 60  # 分词器加载失败后，重新尝试加载前的等待时间（秒）
+
+# 全局共享的 ChatOpenAI 实例，首次使用时才创建，导入本模块不要求配置 API Key
+_llm = None
+_llm_lock = threading.Lock()
+
+def get_llm() -> ChatOpenAI:
+    """
+    获取全局共享的 ChatOpenAI 实例，所有组件复用同一个客户端及其连接池。
+    使用 OpenAI SDK 默认的 httpx 客户端，保留其连接池大小、重定向等默认配置。
+    各组件的系统提示固定放在消息首位且内容不变，便于命中 OpenAI 的前缀缓存（Prompt Caching）。
+    """
+    global _llm
+    with _llm_lock:
+        if _llm is None:
+            _llm = ChatOpenAI(
+                model=MODEL_NAME,
+                temperature=0.5,
+                max_tokens=MAX_OUTPUT_TOKENS,
+                http_client=DefaultHttpxClient(),
+                http_async_client=DefaultAsyncHttpxClient(),
+            )
+        return _llm
+
+# 已加载的分词器，以及最近一次加载失败的时间
+_encoding = None
+_encoding_failed_at = None
+
+def _get_encoding():
+    """
+    获取模型对应的分词器。无法获取时（如离线环境无法下载词表）返回 None。
+    仅缓存加载成功的结果，加载失败时在 ENCODING_RETRY_INTERVAL 秒后重新尝试。
+    """
+    global _encoding, _encoding_failed_at
+    if _encoding is not None:
+        return _encoding
+    if _encoding_failed_at is not None and time.monotonic() - _encoding_failed_at < ENCODING_RETRY_INTERVAL:
+        return None
+
+    try:
+        _encoding = tiktoken.encoding_for_model(MODEL_NAME)
+        _encoding_failed_at = None
+        return _encoding
+    except Exception as e:
+        _encoding_failed_at = time.monotonic()
+        LOG.warning(f"无法加载 {MODEL_NAME} 的分词器，将按字符数估算 token 数: {e}")
+        return None
+
+def estimate_max_tokens(text: str, ratio: int = 2) -> int:
+    """
+    根据输入文本长度估算改写类任务的生成上限，避免异常情况下生成远超所需的内容。
+
+    参数:
+        text (str): 输入文本
+        ratio (int): 生成上限相对输入 token 数的倍数
+
+    返回:
+        int: 介于 MIN_OUTPUT_TOKENS 与 MAX_OUTPUT_TOKENS 之间的生成上限
+    """
+    encoding = _get_encoding()
+    # 分词器不可用时以字符数作为 token 数的上界估计
+    num_tokens = len(encoding.encode(text)) if encoding else len(text)
+    return min(MAX_OUTPUT_TOKENS, max(MIN_OUTPUT_TOKENS, ratio * num_tokens))
+
+def warmup():
+    """
+    提前加载分词器，并发送一个仅生成 1 个 token 的请求建立到 OpenAI 的 TCP/TLS 连接，
+    避免首个用户请求承担初始化与握手开销。
+    """
+    _get_encoding()
+    get_llm().bind(max_tokens=1).invoke([HumanMessage(content="ping")])
+
+# 将 LLM 相关变量公开，允许其他模块通过 from llm_client import get_llm 来使用它
+__all__ = ["get_llm", "MODEL_NAME", "FORMAT_TEMPERATURE", "estimate_max_tokens", "warmup"]
@@ -7,7 +7,6 @@ from layout_manager import LayoutManager
 from config import Config
 from logger import LOG  # 引入 LOG 模块
 from content_formatter import ContentFormatter
-from content_assistant import ContentAssistant
 
 # 新增导入 docx_parser 模块中的函数
 from docx_parser import generate_markdown_from_docx
@@ -15,8 +14,7 @@ from docx_parser import generate_markdown_from_docx
 # 定义主函数，处理输入并生成 PowerPoint 演示文稿
 def main(input_file):
     config = Config()  # 加载配置文件
-    content_formatter = ContentFormatter()
-    content_assistant = ContentAssistant()
+    content_formatter = ContentFormatter(config.content_formatter_prompt)
 
     # 检查输入文件是否存在
     if not os.path.exists(input_file):
@@ -35,8 +33,8 @@ def main(input_file):
         LOG.info(f"正在解析 docx 文件: {input_file}")
         # 调用 generate_markdown_from_docx 函数，获取 markdown 内容
         raw_content = generate_markdown_from_docx(input_file)
-        markdown_content = content_formatter.format(raw_content)
-        input_text = content_assistant.adjust_single_picture(markdown_content)
+        # 一次调用同时完成格式化与单图拆分
+        input_text = content_formatter.format_and_adjust(raw_content)
     else:
         # 不支持的文件类型
         LOG.error(f"暂不支持的文件格式: {file_extension}")
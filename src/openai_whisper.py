@@ -1,27 +1,43 @@
-from transformers import pipeline
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+from faster_whisper.vad import get_speech_timestamps
+from scipy.signal import resample_poly
 import gradio as gr
+import numpy as np
+import soundfile as sf
 import torch
 import tempfile
+import threading
+import math
 import os
 import subprocess
 
 from logger import LOG
 
 # 模型名称和参数配置
-MODEL_NAME = "openai/whisper-large-v3"  # Whisper 模型名称
-BATCH_SIZE = 8  # 处理批次大小
+MODEL_NAME = "large-v3"  # Whisper 模型名称（CTranslate2 格式）
+COMPUTE_TYPE = "int8"  # INT8 量化，显存占用约减半且识别准确率基本不变
+BATCH_SIZE = 8  # 长音频切分后并行解码的片段数
+MAX_CONCURRENT_ASR = 2  # 同时进行语音识别的最大请求数，避免突发上传导致 GPU 过载
+SAMPLING_RATE = 16000  # Whisper 模型输入的采样率
+PCM_FORMATS = ('.wav', '.flac')  # 可直接用 soundfile 读取、无需 ffmpeg 转换的音频格式
 
 # 检查是否可以使用 GPU，否则使用 CPU
-device = "cuda:0" if torch.cuda.is_available() else "cpu"
+device = "cuda" if torch.cuda.is_available() else "cpu"
 
-# 初始化语音识别管道
-pipe = pipeline(
-    task="automatic-speech-recognition",  # 自动语音识别任务
-    model=MODEL_NAME,  # 指定模型
-    chunk_length_s=60,  # 每个音频片段的长度（秒）
+# 初始化语音识别模型
+model = WhisperModel(
+    MODEL_NAME,  # 指定模型
     device=device,  # 指定设备
+    compute_type=COMPUTE_TYPE,  # 指定量化精度
+    num_workers=MAX_CONCURRENT_ASR,  # 与并发上限一致，使多个线程的识别请求可以真正并行执行
 )
 
+# 批量推理管道：按 VAD 检测的语音边界将长音频切分为不超过 30 秒的片段并批量解码
+batched_model = BatchedInferencePipeline(model=model)
+
+# 限制并发识别请求数的信号量，与模型的 num_workers 保持一致
+asr_semaphore = threading.BoundedSemaphore(MAX_CONCURRENT_ASR)
+
 def convert_to_wav(input_path):
     """
     将音频文件转换为 WAV 格式并返回新文件路径。
@@ -39,7 +55,7 @@ def convert_to_wav(input_path):
     try:
         # 使用 ffmpeg 将音频文件转换为指定格式
         subprocess.run(
-            ["ffmpeg", "-y", "-i", input_path, "-ar", "16000", "-ac", "1", output_path],
+            ["ffmpeg", "-y", "-i", input_path, "-ar", str(SAMPLING_RATE), "-ac", "1", output_path],
             check=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE
@@ -57,6 +73,58 @@ def convert_to_wav(input_path):
             os.remove(output_path)
         raise gr.Error("服务器配置错误，缺少 ffmpeg。请联系管理员。")
 
+def read_with_ffmpeg(audio_file):
+    """
+    通过 ffmpeg 将音频文件转换为 WAV 后读取。
+
+    参数:
+    - audio_file: 输入的音频文件路径
+
+    返回:
+    - audio, sampling_rate: 音频数组及其采样率
+    """
+    # 转换音频文件为 WAV 格式
+    wav_file = convert_to_wav(audio_file)
+    try:
+        return sf.read(wav_file, dtype="float32")
+    finally:
+        # 删除临时转换后的 WAV 文件
+        if os.path.exists(wav_file):
+            os.remove(wav_file)
+
+def load_audio(audio_file):
+    """
+    读取音频文件为 16kHz 单声道 float32 数组。
+    WAV/FLAC 文件优先直接在进程内读取，libsndfile 无法解码（如不支持的编码格式）时
+    以及其他格式（如 MP3）通过 ffmpeg 转换为 WAV 后读取。
+
+    参数:
+    - audio_file: 输入的音频文件路径
+
+    返回:
+    - audio: 16kHz 单声道 float32 音频数组
+    """
+    file_ext = os.path.splitext(audio_file)[1].lower()
+    if file_ext in PCM_FORMATS:
+        try:
+            audio, sampling_rate = sf.read(audio_file, dtype="float32")
+        except sf.LibsndfileError as e:
+            LOG.warning(f"soundfile 无法直接读取 {audio_file}，改用 ffmpeg 转换: {e}")
+            audio, sampling_rate = read_with_ffmpeg(audio_file)
+    else:
+        audio, sampling_rate = read_with_ffmpeg(audio_file)
+
+    # 多声道音频取均值转换为单声道
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+
+    # 重采样至模型要求的采样率
+    if sampling_rate != SAMPLING_RATE:
+        divisor = math.gcd(SAMPLING_RATE, sampling_rate)
+        audio = resample_poly(audio, SAMPLING_RATE // divisor, sampling_rate // divisor).astype(np.float32)
+
+    return audio
+
 def asr(audio_file, task="transcribe"):
     """
     对音频文件进行语音识别或翻译。
@@ -68,28 +136,44 @@ def asr(audio_file, task="transcribe"):
     返回:
     - text: 识别或翻译后的文本内容
     """
-    # 转换音频文件为 WAV 格式
-    wav_file = convert_to_wav(audio_file)
+    try:
+        audio = load_audio(audio_file)
+    except sf.LibsndfileError as e:
+        LOG.error(f"音频文件读取失败: {e}")
+        raise gr.Error("音频文件读取失败。请上传有效的音频文件。")
 
     try:
-        # 使用管道进行转录或翻译
-        result = pipe(
-            wav_file,
-            batch_size=BATCH_SIZE,
-            generate_kwargs={"task": task},
-            return_timestamps=True
-        )
-        text = result["text"]
+        # 解码在读取 segments 时才真正执行，因此整个识别过程都需持有信号量
+        with asr_semaphore:
+            # 使用批量推理管道进行转录或翻译，VAD 切分片段的同时过滤静音，避免幻觉式重复输出
+            segments, _ = batched_model.transcribe(
+                audio,
+                task=task,
+                beam_size=1,
+                vad_filter=True,
+                batch_size=BATCH_SIZE,
+            )
+            text = "".join(segment.text for segment in segments).strip()
         LOG.info(f"[识别结果]：{text}")
 
         return text
     except Exception as e:
         LOG.error(f"处理音频文件时出错: {e}")
         raise gr.Error(f"处理音频文件时出错：{str(e)}")
-    finally:
-        # 删除临时转换后的 WAV 文件
-        if os.path.exists(wav_file):
-            os.remove(wav_file)
+
+def warmup(duration_s=1):
+    """
+    使用一段静音音频预热语音识别模型与 VAD 模型，避免首个用户请求承担初始化开销。
+
+    参数:
+    - duration_s: 静音音频的时长（秒）
+    """
+    silence = np.zeros(int(SAMPLING_RATE * duration_s), dtype=np.float32)
+    # 关闭 VAD，否则静音会被全部过滤而不会真正执行解码，从而无法预热 CTranslate2 推理
+    segments, _ = model.transcribe(silence, beam_size=1, vad_filter=False)
+    list(segments)
+    # 实际请求开启了 VAD，Silero VAD 模型在首次使用时才加载（含 onnxruntime 会话创建），在此提前运行一次
+    get_speech_timestamps(silence)
 
 def transcribe(inputs, task):
     """
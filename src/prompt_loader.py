@@ -0,0 +1,25 @@
+# prompt_loader.py
+
+import os
+from functools import lru_cache
+
+@lru_cache(maxsize=32)
+def _read_prompt(prompt_file: str, mtime_ns: int) -> str:
+    """
+    读取提示文件内容。以文件修改时间作为缓存键的一部分，文件更新后自动重新读取。
+    """
+    with open(prompt_file, "r", encoding="utf-8") as file:
+        return file.read().strip()
+
+def read_prompt(prompt_file: str) -> str:
+    """
+    从文件加载系统提示语，相同且未修改的文件只读取一次。
+
+    参数:
+        prompt_file (str): 提示文件路径
+
+    返回:
+        str: 去除首尾空白后的提示内容
+    """
+    prompt_file = os.path.abspath(prompt_file)
+    return _read_prompt(prompt_file, os.stat(prompt_file).st_mtime_ns)
@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+
+# 添加 src 目录到模块搜索路径，以便可以导入 src 目录中的模块
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import chat_history
+from chat_history import get_session_history
+
+class TestChatHistory(unittest.TestCase):
+    """
+    测试 chat_history 模块的 get_session_history 函数，验证会话淘汰与历史截断逻辑。
+    """
+
+    def setUp(self):
+        chat_history.store.clear()
+
+    def test_same_session_returns_same_history(self):
+        history = get_session_history("session_a")
+        self.assertIs(get_session_history("session_a"), history)
+
+    def test_history_is_trimmed_to_max_turns(self):
+        history = get_session_history("session_a")
+        for i in range(chat_history.MAX_TURNS + 3):
+            history.add_messages([HumanMessage(content=f"问题 {i}"), AIMessage(content=f"回答 {i}")])
+
+        messages = get_session_history("session_a").messages
+        self.assertEqual(len(messages), 2 * chat_history.MAX_TURNS)
+        # 保留的是最近的对话，且仍以用户消息开头
+        self.assertIsInstance(messages[0], HumanMessage)
+        self.assertEqual(messages[-1].content, f"回答 {chat_history.MAX_TURNS + 2}")
+
+    def test_history_is_trimmed_in_place(self):
+        history = get_session_history("session_a")
+        messages = history.messages
+        for i in range(chat_history.MAX_TURNS + 1):
+            history.add_messages([HumanMessage(content=f"问题 {i}"), AIMessage(content=f"回答 {i}")])
+
+        get_session_history("session_a")
+        # 截断不替换列表对象，持有旧引用的并发写入不会丢失
+        self.assertIs(history.messages, messages)
+        self.assertEqual(len(messages), 2 * chat_history.MAX_TURNS)
+
+    def test_least_recently_used_session_is_evicted(self):
+        for i in range(chat_history.MAX_SESSIONS):
+            get_session_history(f"session_{i}")
+
+        # 访问最早的会话，使其成为最近访问的会话
+        get_session_history("session_0")
+        get_session_history("session_new")
+
+        self.assertEqual(len(chat_history.store), chat_history.MAX_SESSIONS)
+        self.assertIn("session_0", chat_history.store)
+        self.assertNotIn("session_1", chat_history.store)
+
+    def tearDown(self):
+        chat_history.store.clear()
+
+if __name__ == "__main__":
+    unittest.main()
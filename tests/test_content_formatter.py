@@ -0,0 +1,54 @@
+import unittest
+import os
+import sys
+from unittest import mock
+
+# 添加 src 目录到模块搜索路径，以便可以导入 src 目录中的模块
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from langchain_core.messages import AIMessage
+
+import content_formatter
+from content_formatter import ContentFormatter
+
+class TestFormatAndAdjustCache(unittest.TestCase):
+    """
+    测试 ContentFormatter.format_and_adjust 的结果缓存：相同输入复用结果，被截断的输出不写入缓存。
+    """
+
+    def setUp(self):
+        content_formatter._format_cache.clear()
+        # 不创建真实的 LLM 客户端，也不调用 create_chain 之外的初始化逻辑
+        with mock.patch.object(ContentFormatter, "create_formatter"):
+            self.formatter = ContentFormatter(
+                os.path.join(os.path.dirname(__file__), '../prompts/content_formatter.txt'))
+        self.formatter.formatter_prompt = None
+
+    def mock_chain(self, finish_reason):
+        chain = mock.Mock()
+        chain.invoke.return_value = AIMessage(
+            content="# 格式化结果", response_metadata={"finish_reason": finish_reason})
+        return mock.patch.object(self.formatter, "create_chain", return_value=chain)
+
+    def test_same_input_is_cached(self):
+        with self.mock_chain("stop") as create_chain:
+            self.assertEqual(self.formatter.format_and_adjust("原始内容"), "# 格式化结果")
+            self.assertEqual(self.formatter.format_and_adjust("原始内容"), "# 格式化结果")
+        self.assertEqual(create_chain.call_count, 1)
+
+    def test_truncated_output_is_not_cached(self):
+        with self.mock_chain("length") as create_chain:
+            self.formatter.format_and_adjust("原始内容")
+            self.formatter.format_and_adjust("原始内容")
+        self.assertEqual(create_chain.call_count, 2)
+
+    def test_cache_size_is_bounded(self):
+        with self.mock_chain("stop"):
+            for i in range(content_formatter.CACHE_SIZE + 5):
+                self.formatter.format_and_adjust(f"原始内容 {i}")
+        self.assertEqual(len(content_formatter._format_cache), content_formatter.CACHE_SIZE)
+        # 最早的条目已被淘汰
+        self.assertNotIn((self.formatter.prompt, "原始内容 0"), content_formatter._format_cache)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import os
+import sys
+from unittest import mock
+
+# 添加 src 目录到模块搜索路径，以便可以导入 src 目录中的模块
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import llm_client
+from llm_client import estimate_max_tokens, MIN_OUTPUT_TOKENS, MAX_OUTPUT_TOKENS
+
+class FakeEncoding:
+    """
+    模拟分词器：每个字符编码为 2 个 token。
+    """
+    def encode(self, text):
+        return [0] * (2 * len(text))
+
+class TestEstimateMaxTokens(unittest.TestCase):
+    """
+    测试 llm_client 模块的 estimate_max_tokens 函数，验证生成上限的估算逻辑。
+    """
+
+    def setUp(self):
+        llm_client._encoding = None
+        llm_client._encoding_failed_at = None
+
+    def test_budget_uses_encoding(self):
+        with mock.patch.object(llm_client, "_get_encoding", return_value=FakeEncoding()):
+            # 1000 个字符 -> 2000 个 token -> 生成上限 4000
+            self.assertEqual(estimate_max_tokens("a" * 1000), 4000)
+
+    def test_budget_falls_back_to_character_count(self):
+        with mock.patch.object(llm_client, "_get_encoding", return_value=None):
+            self.assertEqual(estimate_max_tokens("a" * 1000), 2000)
+
+    def test_budget_is_clamped(self):
+        with mock.patch.object(llm_client, "_get_encoding", return_value=None):
+            self.assertEqual(estimate_max_tokens("hi"), MIN_OUTPUT_TOKENS)
+            self.assertEqual(estimate_max_tokens("a" * 100000), MAX_OUTPUT_TOKENS)
+
+    def test_encoding_failure_is_not_cached(self):
+        encoding = FakeEncoding()
+        with mock.patch.object(llm_client.tiktoken, "encoding_for_model", side_effect=[OSError("offline"), encoding]):
+            self.assertIsNone(llm_client._get_encoding())
+            # 重试间隔内不重复尝试加载
+            self.assertIsNone(llm_client._get_encoding())
+            # 超过重试间隔后重新加载成功
+            llm_client._encoding_failed_at -= llm_client.ENCODING_RETRY_INTERVAL
+            self.assertIs(llm_client._get_encoding(), encoding)
+            self.assertIs(llm_client._get_encoding(), encoding)
+
+    def tearDown(self):
+        llm_client._encoding = None
+        llm_client._encoding_failed_at = None
+
+if __name__ == "__main__":
+    unittest.main()
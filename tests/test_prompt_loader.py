@@ -0,0 +1,54 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# 添加 src 目录到模块搜索路径，以便可以导入 src 目录中的模块
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from prompt_loader import read_prompt, _read_prompt
+
+class TestPromptLoader(unittest.TestCase):
+    """
+    测试 prompt_loader 模块的 read_prompt 函数，验证提示文件的读取与缓存逻辑。
+    """
+
+    def setUp(self):
+        """
+        创建临时提示文件，并清空缓存。
+        """
+        _read_prompt.cache_clear()
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as file:
+            file.write("  你是一个 PPT 助手。\n")
+            self.prompt_file = file.name
+
+    def test_read_prompt_strips_content(self):
+        self.assertEqual(read_prompt(self.prompt_file), "你是一个 PPT 助手。")
+
+    def test_read_prompt_uses_cache(self):
+        read_prompt(self.prompt_file)
+        read_prompt(self.prompt_file)
+        self.assertEqual(_read_prompt.cache_info().hits, 1)
+
+    def test_read_prompt_reloads_modified_file(self):
+        read_prompt(self.prompt_file)
+        with open(self.prompt_file, "w", encoding="utf-8") as file:
+            file.write("新的提示")
+        # 显式设置修改时间，避免文件系统时间精度导致 mtime 未变化
+        stat = os.stat(self.prompt_file)
+        os.utime(self.prompt_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(read_prompt(self.prompt_file), "新的提示")
+
+    def test_read_prompt_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            read_prompt(self.prompt_file + ".missing")
+
+    def tearDown(self):
+        """
+        清理临时文件。
+        """
+        if os.path.exists(self.prompt_file):
+            os.remove(self.prompt_file)
+
+if __name__ == "__main__":
+    unittest.main()